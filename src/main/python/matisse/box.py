@@ -132,7 +132,7 @@ class Box(object):
     source : str
       string (as single stream) containing the source
     """
-    match = re.search(Box.regexs['style'], source)
+    match = Box.regexs['style'].search(source)
     if match:
       style = match.group('style')
       if style:
@@ -147,7 +147,7 @@ class Box(object):
     source : str
       string (as single stream) containing the source
     """
-    match = re.search(Box.regexs['caption'], source)
+    match = Box.regexs['caption'].search(source)
     if match:
       cap_type = match.group('cap_type')
       if cap_type:
@@ -158,7 +158,7 @@ class Box(object):
       cap_options = match.group('cap_options')
       if cap_options:
         self.cap_options = cap_options.strip()
-        cap_position = re.search(Box.regexs['caption_pos'], self.cap_options)
+        cap_position = Box.regexs['caption_pos'].search(self.cap_options)
         if cap_position:
           self.cap_position = cap_position.group('cap_position').strip()
           self.cap_options = self.cap_options.replace(cap_position.group('cap_pos'), '')
@@ -178,9 +178,9 @@ class Box(object):
       string (as single stream) containing the source
     """
     if self.ctn_type == 'figure' or self.ctn_type == 'video':
-      match = re.search(Box.regexs['content_fig'], source)
+      match = Box.regexs['content_fig'].search(source)
     else:
-      match = re.search(Box.regexs['content'], source)
+      match = Box.regexs['content'].search(source)
     if match:
       ctn_type = match.group('ctn_type')
       if ctn_type:
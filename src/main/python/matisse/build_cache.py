@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+"""
+build_cache.py, module definition of BuildCache class.
+"""
+
+import hashlib
+import json
+import os
+import yattag
+import yaml
+from .markdown_utils import markdown_signature
+
+
+class BuildCache(object):
+  """
+  Cache of the rendered presentations, keyed on the content hash of the complete source, of the configuration and of
+  the signature of the rendering code (MaTiSSe.py modules, markdown signature, yattag and PyYAML versions).
+
+  The markdown conversions are cached too, thus when a presentation must be rendered again only the changed
+  contents are actually converted.
+
+  Attributes
+  ----------
+  max_entries : int
+    maximum number of cached presentations (and of cached markdown conversions), the oldest ones are purged first
+  max_bytes : int
+    maximum total size of cached presentations, the oldest ones are purged first
+  """
+  max_entries = 4096
+  max_bytes = 128 * 1024 * 1024
+
+  def __init__(self, version, path=None):
+    """
+    Parameters
+    ----------
+    version : str
+      MaTiSSe.py version, part of the hash key
+    path : str
+      cache directory, default $XDG_CACHE_HOME/matisse or ~/.cache/matisse
+
+    Attributes
+    ----------
+    version : str
+      MaTiSSe.py version, part of the hash key
+    path : str
+      cache directory
+    signature : str
+      signature of the rendering code, part of the hash key
+    """
+    self.version = version
+    if path is None:
+      path = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'), 'matisse')
+    self.path = path
+    self.signature = hashlib.sha256('\n'.join([version,
+                                               BuildCache.__code_digest(),
+                                               markdown_signature(),
+                                               'yattag-' + yattag.__version__,
+                                               'pyyaml-' + yaml.__version__]).encode('utf-8')).hexdigest()
+    return
+
+  @staticmethod
+  def __code_digest():
+    """Compute the digest of MaTiSSe.py code, namely of its modules: any change of them may change the html.
+
+    Returns
+    -------
+    str
+      digest of MaTiSSe.py modules
+    """
+    digest = hashlib.sha256()
+    package = os.path.dirname(os.path.abspath(__file__))
+    for module in sorted(os.listdir(package)):
+      if module.endswith('.py'):
+        with open(os.path.join(package, module), 'rb') as code:
+          digest.update(module.encode('utf-8') + b'\0' + code.read())
+    return digest.hexdigest()
+
+  def key(self, source, config):
+    """Compute the hash key of a presentation.
+
+    Parameters
+    ----------
+    source : str
+      complete source of presentation, namely after including external files
+    config : MatisseConfig
+      MaTiSSe configuration
+
+    Returns
+    -------
+    str
+      hash key
+    """
+    digest = hashlib.sha256(self.signature.encode('utf-8'))
+    digest.update(repr(sorted(vars(config).items())).encode('utf-8'))
+    digest.update(source.encode('utf-8'))
+    return digest.hexdigest()
+
+  def load(self, key):
+    """Load the html of a cached presentation.
+
+    Parameters
+    ----------
+    key : str
+      hash key
+
+    Returns
+    -------
+    str
+      html of presentation, None if it is not cached
+    """
+    try:
+      with open(os.path.join(self.path, key + '.html'), 'r') as html:
+        return html.read()
+    except (IOError, OSError):
+      return None
+
+  def store(self, key, html):
+    """Store the html of a presentation into the cache.
+
+    An unwritable cache is silently ignored.
+
+    Parameters
+    ----------
+    key : str
+      hash key
+    html : str
+      html of presentation
+    """
+    try:
+      if not os.path.exists(self.path):
+        os.makedirs(self.path)
+      cached = os.path.join(self.path, key + '.html')
+      with open(cached + '.tmp', 'w') as html_tmp:
+        html_tmp.write(html)
+      os.replace(cached + '.tmp', cached)
+      self.__purge()
+    except (IOError, OSError):
+      self.__remove(path=os.path.join(self.path, key + '.html.tmp'))
+    return
+
+  def load_conversions(self):
+    """Load the cached markdown conversions.
+
+    Returns
+    -------
+    dict
+      markdown conversions, empty if they are not cached
+    """
+    try:
+      with open(self.__conversions_path(), 'r') as conversions:
+        return json.load(conversions)
+    except (IOError, OSError, ValueError):
+      return {}
+
+  def store_conversions(self, conversions):
+    """Store the markdown conversions into the cache, retaining only the most recently used ones.
+
+    An unwritable cache is silently ignored.
+
+    Parameters
+    ----------
+    conversions : dict
+      markdown conversions, the most recently used being the last ones
+    """
+    try:
+      if not os.path.exists(self.path):
+        os.makedirs(self.path)
+      cached = self.__conversions_path()
+      with open(cached + '.tmp', 'w') as conversions_tmp:
+        json.dump(dict(list(conversions.items())[-self.max_entries:]), conversions_tmp)
+      os.replace(cached + '.tmp', cached)
+    except (IOError, OSError):
+      self.__remove(path=self.__conversions_path() + '.tmp')
+    return
+
+  def __conversions_path(self):
+    """Return the path of the cached markdown conversions.
+
+    The conversions are cached separately for each signature of the rendering code, their html depending on the
+    markdown signature (Python-Markdown version and extensions set) and on the in-repo extensions (mdx_mathjax.py,
+    mdx_custom_span_class.py) that the code digest covers.
+    """
+    return os.path.join(self.path, 'markdown-' + self.signature + '.json')
+
+  @staticmethod
+  def __remove(path):
+    """Remove a (temporary) file, if any.
+
+    Parameters
+    ----------
+    path : str
+      file path
+    """
+    try:
+      os.remove(path)
+    except (IOError, OSError):
+      pass
+    return
+
+  def __purge(self):
+    """Purge the oldest cached presentations exceeding the maximum number of entries or the maximum total size."""
+    entries = []
+    for entry in os.listdir(self.path):
+      if entry.endswith('.html'):
+        path = os.path.join(self.path, entry)
+        stat = os.stat(path)
+        entries.append((stat.st_mtime, stat.st_size, path))
+    entries.sort()
+    total_bytes = sum(size for _, size, _ in entries)
+    for number, (_, size, path) in enumerate(entries):
+      if len(entries) - number <= self.max_entries and total_bytes <= self.max_bytes:
+        break
+      os.remove(path)
+      total_bytes -= size
+    return
@@ -3,7 +3,6 @@
 chapter.py, module definition of Chapter class.
 """
 
-from collections import OrderedDict
 from .section import Section
 
 
@@ -28,7 +27,7 @@ class Chapter(object):
     self.number = number
     self.title = title
     self.sections = []
-    self.toc = OrderedDict()
+    self.toc = {}
     return
 
   def __str__(self):
@@ -61,7 +60,8 @@ class Chapter(object):
     ----------
     doc: Doc
     """
-    doc.attr(('chapternumber', str(self.number)))
     if self.title is not None:
-      doc.attr(('chaptertitle', str(self.title)))
+      doc.attr(('chapternumber', str(self.number)), ('chaptertitle', str(self.title)))
+    else:
+      doc.attr(('chapternumber', str(self.number)))
     return
@@ -66,11 +66,11 @@ class Columns(object):
     source : str
       string (as single stream) containing the source
     """
-    match = re.search(Columns.regexs['columns'], source)
+    match = Columns.regexs['columns'].search(source)
     if match:
       source_columns = match.group('env')
       columns = []
-      for match_col in re.finditer(Columns.regexs['column'], source_columns):
+      for match_col in Columns.regexs['column'].finditer(source_columns):
         columns.append([match_col.group('options'), match_col.start(), match_col.end()])
       if len(columns) > 0:
         for col, column in enumerate(columns):
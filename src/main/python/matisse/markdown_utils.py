@@ -6,15 +6,80 @@ import markdown
 from .mdx_mathjax import MathJaxExtension
 from .mdx_custom_span_class import CustomSpanClassExtension
 try:
+  import markdown_checklist
   from markdown_checklist.extension import ChecklistExtension
   __mdx_checklist__ = True
 except ImportError:
   __mdx_checklist__ = False
+if isinstance(markdown.__version__, str):
+  __markdown_signature__ = 'markdown-' + markdown.__version__
+else:  # Python-Markdown 2.x, __version__ is the module defining version
+  __markdown_signature__ = 'markdown-' + markdown.version
+if __mdx_checklist__:
+  __markdown_signature__ += '-checklist-' + str(getattr(markdown_checklist, '__version__', ''))
+__conversions__ = {}
+__conversions_max__ = 4096
+
+
+def markdown_converter():
+  """Return a new markdown converter.
+
+  A converter cannot be shared among conversions: reset does not clear all the extensions state, e.g. the
+  abbreviations defined by the abbr extension (of extra) are kept and would leak into the following conversions.
+
+  Returns
+  -------
+  markdown.Markdown
+    markdown converter
+  """
+  if __mdx_checklist__:
+    return markdown.Markdown(output_format='html5',
+                             extensions=['smarty',
+                                         'extra',
+                                         CustomSpanClassExtension(),
+                                         ChecklistExtension(),
+                                         MathJaxExtension()])
+  return markdown.Markdown(output_format='html5',
+                           extensions=['smarty',
+                                       'extra',
+                                       MathJaxExtension()])
+
+
+def markdown_signature():
+  """Return the signature of the markdown conversions.
+
+  The signature identifies the Python-Markdown version and the extensions set: conversions made with a different
+  signature may differ.
+
+  Returns
+  -------
+  str
+    signature of the markdown conversions
+  """
+  return __markdown_signature__
+
+
+def markdown_conversions():
+  """Return the memo of the markdown conversions.
+
+  The memo maps each converted markdown source to its html, the most recently used sources being the last ones. It
+  can be seeded with the conversions of previous runs, e.g. loaded from BuildCache.
+
+  Returns
+  -------
+  dict
+    memo of the markdown conversions
+  """
+  return __conversions__
 
 
 def markdown2html(source, no_p=False):
   """Convert markdown source to html.
 
+  The conversion is a pure function of the source, thus results are memoized: repeated sources (e.g. the same caption
+  or content rendered more times) are converted only once. The memo retains the __conversions_max__ most recently used
+  conversions.
+
   Parameters
   ----------
   source : str
@@ -27,19 +92,12 @@ def markdown2html(source, no_p=False):
   str
     converted source
   """
-  if __mdx_checklist__:
-    mkd = markdown.Markdown(output_format='html5',
-                            extensions=['smarty',
-                                        'extra',
-                                        CustomSpanClassExtension(),
-                                        ChecklistExtension(),
-                                        MathJaxExtension()])
-  else:
-    mkd = markdown.Markdown(output_format='html5',
-                            extensions=['smarty',
-                                        'extra',
-                                        MathJaxExtension()])
-  markup = mkd.reset().convert(source)
+  markup = __conversions__.pop(source, None)
+  if markup is None:
+    markup = markdown_converter().convert(source)
+  __conversions__[source] = markup
+  while len(__conversions__) > __conversions_max__:
+    del __conversions__[next(iter(__conversions__))]
   if no_p:
     p_start = '<p>'
     p_end = '</p>'
@@ -4,10 +4,12 @@ MaTiSSe.py, Markdown To Impressive Scientific Slides
 """
 
 import argparse
+from functools import lru_cache
+import mmap
 import os
+from pathlib import Path
 import sys
 from .matisse_config import MatisseConfig
-from .presentation import Presentation
 
 __appname__ = "MaTiSSe.py"
 __description__ = "MaTiSSe.py, Markdown To Impressive Scientific Slides"
@@ -17,81 +19,110 @@ __author__ = "Stefano Zaghi"
 __author_email__ = "stefano.zaghi@gmail.com"
 __license__ = "GNU General Public License v3 (GPLv3)"
 __url__ = "https://github.com/szaghi/MaTiSSe"
-__sample__ = r"""
----
-metadata:
-  - title: "Autogenerated Sample"
-  - conference: "Very nice Conference"
-  - date: "12th December 2012"
-  - authors:
-    - Stefano Zaghi
-    - John Doe
-  - authors_short:
-    - S. Zaghi
-    - J. Doe
-  - affiliations:
-    - University 1
-    - University 2
-  - affiliations_short:
-    - Univ. 1
-    - Univ. 2
----
+__cliargs__ = ((('-v', '--version'), {'action': 'version', 'help': 'Show version', 'version': '%(prog)s ' + __version__}),
+               (('-i', '--input'), {'help': 'Input file name of markdown source to be parsed'}),
+               (('-o', '--output'), {'help': 'Output directory name containing the presentation files'}),
+               (('-t', '--theme'), {'help': 'Select a builtin theme for initializing a new sample presentation'}),
+               (('-hs', '--highlight-style'), {'default': 'github.css', 'help': 'Select the highlight.js style (default github.css); select "disable" to disable highligth.js', 'metavar': 'STYLE.CSS'}),
+               (('-s', '--sample'), {'help': 'Generate a new sample presentation as skeleton of your one'}),
+               (('--toc-at-chap-beginning',), {'help': 'Insert Table of Contents at each chapter beginning (default no): to activate indicate the TOC depth', 'metavar': 'TOC-DEPTH'}),
+               (('--toc-at-sec-beginning',), {'help': 'Insert Table of Contents at each section beginning (default no): to activate indicate the TOC depth', 'metavar': 'TOC-DEPTH'}),
+               (('--toc-at-subsec-beginning',), {'help': 'Insert Table of Contents at each subsection beginning (default no): to activate indicate the TOC depth', 'metavar': 'TOC-DEPTH'}),
+               (('--print-highlight-styles',), {'action': 'store_true', 'default': None, 'help': 'Print the available highlight.js style (default github.css)'}),
+               (('--print-themes',), {'action': 'store_true', 'default': None, 'help': 'Print the list of the builtin themes'}),
+               (('--verbose',), {'action': 'store_true', 'default': False, 'help': 'More verbose printing messages (default no)'}),
+               (('--online-MathJax',), {'action': 'store_true', 'default': None, 'help': 'Use online rendering of LaTeX equations by means of online MathJax service; default use offline, local copy of MathJax engine'}),
+               (('--pdf',), {'action': 'store_true', 'default': False, 'help': 'Disable impress effects for printing slides to pdf'}),
+               (('--no-cache',), {'action': 'store_true', 'default': False, 'help': 'Do not use the cache of rendered presentations (default $XDG_CACHE_HOME/matisse or ~/.cache/matisse)'}),
+               (('--print_parsed_source',), {'action': 'store_true', 'default': False, 'help': 'Print the actually parsed source, namely source after including external files'}))
+__mmap_threshold__ = 1048576
+
+
+@lru_cache(maxsize=1)
+def cliparser():
+  """Return the command line arguments parser.
+
+  The parser is built once, at its first use, from the __cliargs__ table.
 
-# First Chapter
-
-## First Section
-
-### First Subsection
-
-#### First Slide
-
-##### A H5 heading
+  Returns
+  -------
+  argparse.ArgumentParser
+    command line arguments parser
+  """
+  parser = argparse.ArgumentParser(prog=__appname__, description=__description__)
+  for flags, options in __cliargs__:
+    parser.add_argument(*flags, **options)
+  return parser
 
-Lorem ipsum dolor sit amet...
 
-##### Math
+def decode_source(raw):
+  """Decode a markdown source as utf-8, falling back to latin-1 for legacy sources.
 
-$$
-x=\frac{-b\pm\sqrt{b^2-4ac}}{2a}
-$$
+  Parameters
+  ----------
+  raw: bytes-like
+    source bytes
 
-$note
-$content{Just a note enviroment}
-$endnote
+  Returns
+  -------
+  str
+    source markdown
+  """
+  try:
+    return str(raw, 'utf-8')
+  except UnicodeDecodeError:
+    return str(raw, 'latin-1')
 
-##### Unordered list
 
-+ $authors
-+ $title
+def read_source(path):
+  """Read a markdown source file.
 
-##### Ordered list
+  The file is read by a single unbuffered read, or memory mapped if it is larger than __mmap_threshold__ bytes thus
+  avoiding the copy of its bytes, and decoded as utf-8, falling back to latin-1 for legacy sources; newlines are
+  translated as by text mode reading.
 
-1. $affiliations
-1. $conference
+  Parameters
+  ----------
+  path: str
+    source file path
 
-# Second Chapter
+  Returns
+  -------
+  str
+    source markdown
+  """
+  with open(path, 'rb', buffering=0) as source_file:
+    if os.fstat(source_file.fileno()).st_size > __mmap_threshold__:
+      with mmap.mmap(source_file.fileno(), 0, access=mmap.ACCESS_READ) as raw:
+        source = decode_source(raw=raw)
+    else:
+      source = decode_source(raw=source_file.read())
+  if '\r' in source:
+    source = source.replace('\r\n', '\n').replace('\r', '\n')
+  return source
 
-## Second Section
 
-### Second Subsection
+def make_cache(cliargs):
+  """Make the cache of rendered presentations.
 
-#### Second Slide
+  Parameters
+  ----------
+  cliargs: argparse.Namespace
+    command line arguments
 
-$table
-$caption{Just a table enviroment}
-$content{
-| Foo | Bar | Baz | Authors  | Title  |
-|-----|-----|-----|----------|--------|
-| 1   |  2  |  3  | $authors | $title |
-| 2   |  3  |  4  |    /     |   /    |
-| 3   |  4  |  5  |    /     |   /    |
-| 4   |  5  |  6  |    /     |   /    |
-}
-$endtable
-"""
+  Returns
+  -------
+  BuildCache()
+    cache of rendered presentations, None if it is disabled
+  """
+  if cliargs.no_cache:
+    return None
+  # imported lazily: the cache key depends on the presentation machinery (markdown, yaml, yattag)
+  from .build_cache import BuildCache
+  return BuildCache(version=__version__)
 
 
-def make_presentation(config, source, output):
+def make_presentation(config, source, output, cache=None):
   """Make the presentation.
 
   Parameters
@@ -101,64 +132,67 @@ def make_presentation(config, source, output):
     source markdown
   output: str
     output path
+  cache: BuildCache()
+    cache of rendered presentations, default none
 
   Returns
   -------
   source: str
     the parsed source
   """
-  config.make_output_tree(output=output)
-  if config.theme is not None:
-    source = config.put_theme(source=source, output=output)
-  presentation = Presentation()
-  presentation.parse(config=config, source=source)
-  presentation.save(config=config, output=output)
+  # imported lazily: the other CLI modes do not need the presentation machinery (markdown, yaml, yattag)
+  from concurrent.futures import ThreadPoolExecutor
+  from .presentation import Presentation
+  # slides must be rendered sequentially (see Presentation.to_html), but the copy of the assets (MathJax, highlight.js...)
+  # into the output tree is I/O bound and independent of parsing and rendering: overlap them
+  with ThreadPoolExecutor(max_workers=1) as executor:
+    output_tree = executor.submit(config.make_output_tree, output=output)
+    if config.theme is not None:
+      source = config.put_theme(source=source, output=output)
+    presentation = Presentation()
+    presentation.parse(config=config, source=source)
+    html_source = presentation.render(config=config, cache=cache)
+    output_tree.result()
+  presentation.save(config=config, output=output, html_source=html_source)
   return source
 
 
 def main():
   """Main function."""
-  cliparser = argparse.ArgumentParser(prog=__appname__, description='MaTiSSe.py, Markdown To Impressive Scientific Slides')
-  cliparser.add_argument('-v', '--version', action='version', help='Show version', version='%(prog)s ' + __version__)
-  cliparser.add_argument('-i', '--input', required=False, action='store', default=None, help='Input file name of markdown source to be parsed')
-  cliparser.add_argument('-o', '--output', required=False, action='store', default=None, help='Output directory name containing the presentation files')
-  cliparser.add_argument('-t', '--theme', required=False, action='store', default=None, help='Select a builtin theme for initializing a new sample presentation')
-  cliparser.add_argument('-hs', '--highlight-style', required=False, action='store', default='github.css', help='Select the highlight.js style (default github.css); select "disable" to disable highligth.js', metavar='STYLE.CSS')
-  cliparser.add_argument('-s', '--sample', required=False, action='store', default=None, help='Generate a new sample presentation as skeleton of your one')
-  cliparser.add_argument('--toc-at-chap-beginning', required=False, action='store', default=None, help='Insert Table of Contents at each chapter beginning (default no): to activate indicate the TOC depth', metavar='TOC-DEPTH')
-  cliparser.add_argument('--toc-at-sec-beginning', required=False, action='store', default=None, help='Insert Table of Contents at each section beginning (default no): to activate indicate the TOC depth', metavar='TOC-DEPTH')
-  cliparser.add_argument('--toc-at-subsec-beginning', required=False, action='store', default=None, help='Insert Table of Contents at each subsection beginning (default no): to activate indicate the TOC depth', metavar='TOC-DEPTH')
-  cliparser.add_argument('--print-highlight-styles', required=False, action='store_true', default=None, help='Print the available highlight.js style (default github.css)')
-  cliparser.add_argument('--print-themes', required=False, action='store_true', default=None, help='Print the list of the builtin themes')
-  cliparser.add_argument('--verbose', required=False, action='store_true', default=False, help='More verbose printing messages (default no)')
-  cliparser.add_argument('--online-MathJax', required=False, action='store_true', default=None, help='Use online rendering of LaTeX equations by means of online MathJax service; default use offline, local copy of MathJax engine')
-  cliparser.add_argument('--pdf', required=False, action='store_true', default=False, help='Disable impress effects for printing slides to pdf')
-  cliparser.add_argument('--print_parsed_source', required=False, action='store_true', default=False, help='Print the actually parsed source, namely source after including external files')
-  cliargs = cliparser.parse_args()
+  # cheap paths first: the trivial modes do not need the arguments parser
+  if len(sys.argv) == 2:
+    if sys.argv[1] in ('-v', '--version'):
+      print(__appname__ + ' ' + __version__)
+      return
+    elif sys.argv[1] == '--print-themes':
+      sys.stdout.write(MatisseConfig().str_themes() + '\n')
+      return
+    elif sys.argv[1] == '--print-highlight-styles':
+      sys.stdout.write(MatisseConfig().str_highlight_styles() + '\n')
+      return
+  cliargs = cliparser().parse_args()
   config = MatisseConfig(cliargs=cliargs)
   if cliargs.print_themes:
-    print(config.str_themes())
+    sys.stdout.write(config.str_themes() + '\n')
   elif cliargs.print_highlight_styles:
-    print(config.str_highlight_styles())
+    sys.stdout.write(config.str_highlight_styles() + '\n')
   elif cliargs.sample:
-    output = os.path.splitext(os.path.basename(cliargs.sample))[0]
-    output = os.path.normpath(output)
-    source = make_presentation(config=config, source=__sample__, output=output)
-    with open(cliargs.sample, 'w') as sample_file:
-      sample_file.write(source)
+    sample_path = Path(cliargs.sample)
+    sample = read_source(path=os.path.join(os.path.dirname(__file__), 'utils/sample.md'))
+    source = make_presentation(config=config, source=sample, output=sample_path.stem, cache=make_cache(cliargs=cliargs))
+    sample_path.write_bytes(source.encode('utf-8'))
   elif cliargs.input:
-    if not os.path.exists(cliargs.input):
+    input_path = Path(cliargs.input)
+    if not input_path.is_file():
       sys.stderr.write('Error: input file "' + cliargs.input + '" not found!')
       sys.exit(1)
     else:
-      with open(cliargs.input, 'r') as mdf:
-        source = mdf.read()
+      source = read_source(path=cliargs.input)
       if cliargs.output:
-        output = cliargs.output
+        output = os.path.normpath(cliargs.output)
       else:
-        output = os.path.splitext(os.path.basename(cliargs.input))[0]
-      output = os.path.normpath(output)
-      make_presentation(config=config, source=source, output=output)
+        output = input_path.stem
+      make_presentation(config=config, source=source, output=output, cache=make_cache(cliargs=cliargs))
 
 
 if __name__ == '__main__':
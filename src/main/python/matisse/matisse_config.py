@@ -6,7 +6,7 @@ matisse_config.py, module definition of MatisseConfig class.
 import logging
 from dirsync import sync
 import os
-from shutil import copyfile, copytree, rmtree
+from shutil import copyfile
 import sys
 
 
@@ -155,8 +155,6 @@ class MatisseConfig(object):
   def put_theme(self, source, output):
     """Put builtin theme into the source.
 
-    Must be called after the output tree has been made.
-
     Parameters
     ----------
     source : str
@@ -171,20 +169,17 @@ class MatisseConfig(object):
     """
     source_themed = source
     if self.theme:
-      themes = os.path.join(os.path.dirname(__file__), 'utils/builtin_themes')
-      for theme in os.listdir(themes):
-        if theme == self.theme:
-          theme_path = os.path.join(os.path.join(themes, theme), 'theme.yaml')
-          if os.path.exists(theme_path):
-            sync_logger = logging.getLogger('sync_logger')
-            sync(os.path.join(themes, theme), 'theme-' + theme, 'sync', create=True, logger=sync_logger)
-            source_themed = r'$include(' + os.path.join('theme-' + theme, 'theme.yaml') + ')\n' + source_themed
-            metadata_path = os.path.join(os.path.join(themes, theme), 'metadata.yaml')
-            if os.path.exists(metadata_path):
-              source_themed = r'$include(' + os.path.join('theme-' + theme, 'metadata.yaml') + ')\n' + source_themed
-            titlepage_path = os.path.join(os.path.join(themes, theme), 'titlepage.md')
-            if os.path.exists(titlepage_path):
-              source_themed = r'$include(' + os.path.join('theme-' + theme, 'titlepage.md') + ')\n' + source_themed
+      # the theme has already been checked to be a builtin one, no need to look it up
+      theme = os.path.join(os.path.dirname(__file__), 'utils/builtin_themes', self.theme)
+      if os.path.exists(os.path.join(theme, 'theme.yaml')):
+        # dirsync copies only the files changed since the last sync
+        sync_logger = logging.getLogger('sync_logger')
+        sync(theme, 'theme-' + self.theme, 'sync', create=True, logger=sync_logger)
+        source_themed = r'$include(' + os.path.join('theme-' + self.theme, 'theme.yaml') + ')\n' + source_themed
+        if os.path.exists(os.path.join(theme, 'metadata.yaml')):
+          source_themed = r'$include(' + os.path.join('theme-' + self.theme, 'metadata.yaml') + ')\n' + source_themed
+        if os.path.exists(os.path.join(theme, 'titlepage.md')):
+          source_themed = r'$include(' + os.path.join('theme-' + self.theme, 'titlepage.md') + ')\n' + source_themed
     return source_themed
 
   def str_highlight_styles(self):
@@ -263,18 +258,15 @@ class MatisseConfig(object):
     # creating jscript directory
     if not os.path.exists(os.path.join(output, 'js')):
       os.makedirs(os.path.join(output, 'js'))
-    # MathJax engine
+    # MathJax engine and highlight.js are synchronized: on rebuilds only their changed files are copied
+    sync_logger = logging.getLogger('sync_logger')
     if not self.online_mathjax:
-      if os.path.exists(os.path.join(output, 'js/MathJax')):
-        rmtree(os.path.join(output, 'js/MathJax'))
       jscript = os.path.join(os.path.dirname(__file__), 'utils/js/MathJax')
-      copytree(jscript, os.path.join(output, 'js/MathJax'))
+      sync(jscript, os.path.join(output, 'js/MathJax'), 'sync', create=True, purge=True, logger=sync_logger)
     # highlight.js
     if self.highlight:
-      if os.path.exists(os.path.join(output, 'js/highlight')):
-        rmtree(os.path.join(output, 'js/highlight'))
       jscript = os.path.join(os.path.dirname(__file__), 'utils/js/highlight')
-      copytree(jscript, os.path.join(output, 'js/highlight'))
+      sync(jscript, os.path.join(output, 'js/highlight'), 'sync', create=True, purge=True, logger=sync_logger)
     # countDown.js
     jscript = os.path.join(os.path.dirname(__file__), 'utils/js/countDown.js')
     copyfile(jscript, os.path.join(output, 'js/countDown.js'))
@@ -11,7 +11,17 @@ from yattag import Doc
 class Metadata(object):
   """
   Object for handling metadata.
+
+  Attributes
+  ----------
+  regexs: dict
+    dictionary of regexs
+  kinds: tuple
+    kinds of metadata having a special html conversion, in matching order
   """
+  kinds = ('toc', 'logo', 'timer', 'custom')
+  regexs = {'toc_depth': re.compile(r'depth\:(?P<depth>[1-4])\;*'),
+            'custom_value': re.compile(r'value\:(?P<value>.*?)\;')}
 
   @classmethod
   def reset(cls):
@@ -24,10 +34,20 @@ class Metadata(object):
     ----------
     name : str
     value : str|[str]
+
+    Attributes
+    ----------
+    kind : str
+      metadata kind, one of Metadata.kinds or None for plain value metadata
     """
     self.name = name
     self.value = value
     self.regex = re.compile(r"\$" + self.name + r"(\[(?P<style>.*?)\])*", re.DOTALL)
+    self.kind = None
+    for kind in Metadata.kinds:
+      if kind in self.name:
+        self.kind = kind
+        break
     return
 
   def update_value(self, value):
@@ -54,14 +74,18 @@ class Metadata(object):
     max_time: str
       max time for presentation
     """
+    if self.regex.search(source) is None:
+      return source
     codeblocks = parser.tokenizer(source=source, re_search=parser.regexs['codeblock'])
     metadatablocks = parser.tokenizer(source=source, re_search=self.regex, exclude=codeblocks)
     if len(metadatablocks) > 0:
-      parsed_source = source[:metadatablocks[0]['start']]
+      parsed_source = [source[:metadatablocks[0]['start']]]
       for m, metadatablock in enumerate(metadatablocks[:-1]):
-        parsed_source += self.to_html(match=metadatablock['match'], toc_depth=toc_depth, max_time=max_time, current=current) + source[metadatablock['end']:metadatablocks[m + 1]['start']]
-      parsed_source += self.to_html(match=metadatablocks[-1]['match'], toc_depth=toc_depth, max_time=max_time, current=current) + source[metadatablocks[-1]['end']:]
-      return parsed_source
+        parsed_source.append(self.to_html(match=metadatablock['match'], toc_depth=toc_depth, max_time=max_time, current=current))
+        parsed_source.append(source[metadatablock['end']:metadatablocks[m + 1]['start']])
+      parsed_source.append(self.to_html(match=metadatablocks[-1]['match'], toc_depth=toc_depth, max_time=max_time, current=current))
+      parsed_source.append(source[metadatablocks[-1]['end']:])
+      return ''.join(parsed_source)
     return source
 
   def logo_to_html(self, match):
@@ -309,7 +333,7 @@ class Metadata(object):
       actual_depth = int(depth)
       if style is not None:
         if 'depth' in style.lower():
-          match_depth = re.search(r'depth\:(?P<depth>[1-4])\;*', style)
+          match_depth = Metadata.regexs['toc_depth'].search(style)
           if match_depth.group('depth'):
             actual_depth = int(match_depth.group('depth'))
       return actual_depth
@@ -347,9 +371,9 @@ class Metadata(object):
         style = str(match.group('style'))
       if style:
         doc.attr(style=style)
-        value = re.search(r'value\:(?P<value>.*?)\;', style)
+        value = Metadata.regexs['custom_value'].search(style)
         if value:
-          doc.asis(re.search(r'value\:(?P<value>.*?)\;', style).group('value'))
+          doc.asis(value.group('value'))
     return doc.getvalue()
 
   def to_html(self, match, toc_depth=None, max_time=None, current=None):
@@ -366,13 +390,13 @@ class Metadata(object):
     str:
       html stream
     """
-    if 'toc' in self.name:
+    if self.kind == 'toc':
       return self.toc_to_html(match=match, current=current, depth=int(toc_depth))
-    if 'logo' in self.name:
+    if self.kind == 'logo':
       return self.logo_to_html(match)
-    elif 'timer' in self.name:
+    elif self.kind == 'timer':
       return self.timer_to_html(match=match, max_time=max_time)
-    elif 'custom' in self.name:
+    elif self.kind == 'custom':
       return self.custom_to_html(match)
     else:
       doc = Doc()
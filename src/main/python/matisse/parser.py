@@ -35,6 +35,36 @@ class Parser(object):
                    "includeblock": re.compile(r"\$include\((?P<include>.*?)\)")}
     return
 
+  @staticmethod
+  def __tokenize(source, re_search, exclude=None):
+    """Tokenize accordingly to re_search, skipping matches contained into exclude tokens.
+
+    Parameters
+    ----------
+    source: str
+      input stream
+    re_search: compiled regex
+    exclude: list
+      list of start/end index of source lines
+
+    Returns
+    -------
+    tokens: list
+      list of token
+    """
+    tokens = []
+    for match in re_search.finditer(source):
+      start, end = match.span()
+      safe = True
+      if exclude is not None:
+        for exc in exclude:
+          if start >= exc['start'] and end <= exc['end']:
+            safe = False
+            break
+      if safe:
+        tokens.append({'match': match, 'start': start, 'end': end})
+    return tokens
+
   @staticmethod
   def tokenizer(source, re_search, exclude=None, force_all=False):
     """Tokenize accordingly to re_search (and exlude if passed).
@@ -52,21 +82,9 @@ class Parser(object):
     tokens: list
       list of token
     """
-    def __tokenizer(source, re_search, exclude=None):
-      tokens = []
-      for match in re.finditer(re_search, source):
-        safe = True
-        if exclude is not None:
-          for exc in exclude:
-            if match.start() >= exc['start'] and match.end() <= exc['end']:
-              safe = False
-        if safe:
-          tokens.append({'match': match, 'start': match.start(), 'end': match.end()})
-      return tokens
-
-    tokens = __tokenizer(source=source, re_search=re_search, exclude=exclude)
+    tokens = Parser.__tokenize(source=source, re_search=re_search, exclude=exclude)
     if len(tokens) == 0 and force_all:
-      tokens = __tokenizer(source=source, re_search=Parser.regexs['all'], exclude=exclude)
+      tokens = Parser.__tokenize(source=source, re_search=Parser.regexs['all'], exclude=exclude)
       return tokens[:-1]
     return tokens
 
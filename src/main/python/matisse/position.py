@@ -18,10 +18,22 @@ class Position(object):
     """
     Attributes
     ----------
+    position: dict
+      current position
     """
     self.position = {'x': 0, 'y': 0, 'z': 0,
                      'rotx': 0, 'roty': 0, 'rotz': 0,
                      'scale': 1}
+    self.__update = {'absolute': self.__update_position_absolute,
+                     'svgpath': self.__update_position_svgpath,
+                     'horizontal': self.__update_position_horizontal,
+                     '-horizontal': self.__update_position_neg_horizontal,
+                     'vertical': self.__update_position_vertical,
+                     '-vertical': self.__update_position_neg_vertical,
+                     'diagonal': self.__update_position_diagonal,
+                     '-diagonal': self.__update_position_neg_diagonal,
+                     'diagonal-x': self.__update_position_diagonal_neg_x,
+                     'diagonal-y': self.__update_position_diagonal_neg_y}
 
   def __update_position_absolute(self, transition):
     """Update position for absolute transition."""
@@ -89,24 +101,15 @@ class Position(object):
     overtheme: Theme()
       eventual slide overtheme
     """
-    update = {'absolute': self.__update_position_absolute,
-              'svgpath': self.__update_position_svgpath,
-              'horizontal': self.__update_position_horizontal,
-              '-horizontal': self.__update_position_neg_horizontal,
-              'vertical': self.__update_position_vertical,
-              '-vertical': self.__update_position_neg_vertical,
-              'diagonal': self.__update_position_diagonal,
-              '-diagonal': self.__update_position_neg_diagonal,
-              'diagonal-x': self.__update_position_diagonal_neg_x,
-              'diagonal-y': self.__update_position_diagonal_neg_y}
     if overtheme is not None and overtheme.custom:
       theme = overtheme
     else:
       theme = presentation_theme
 
     transition = theme.get_slide_transition()
-    if transition['transition'].lower() in update:
-      update[transition['transition'].lower()](transition=transition)
+    update = self.__update.get(transition['transition'].lower())
+    if update is not None:
+      update(transition=transition)
     else:
       print('Warning: the slide transition "' + transition['transition'] + '" is unknown!')
-      update['horizontal'](transition=transition)
+      self.__update['horizontal'](transition=transition)
@@ -3,13 +3,18 @@
 presentation.py, module definition of Presentation class.
 """
 
-from collections import OrderedDict
+from bisect import bisect_left, bisect_right
 import logging
 import os
 from dirsync import sync
 from yaml import load_all, YAMLError
+try:
+  from yaml import CSafeLoader as SafeLoader
+except ImportError:
+  from yaml import SafeLoader
 from yattag import Doc, indent
 from .chapter import Chapter
+from .markdown_utils import markdown_conversions
 from .metadata import Metadata
 from .parser import Parser
 from .position import Position
@@ -43,6 +48,8 @@ class Presentation(object):
     metadata: dict
       presentation metadata; each element of the dictionary if a dict with ['value', 'user'] items: value contains
       the metadata value and user indicates if the value comes from user (if True) or from defaults (if False).
+    source: str
+      complete source of presentation, namely after including external files
     """
     self.reset()
     self.metadata = {'title': Metadata(name='title', value=''),
@@ -64,7 +71,7 @@ class Presentation(object):
                      'max_time': Metadata(name='max_time', value='25'),
                      'total_slides_number': Metadata(name='total_slides_number', value=''),
                      'dirs_to_copy': Metadata(name='dirs_to_copy', value=[]),
-                     'toc': Metadata(name='toc', value=OrderedDict()),
+                     'toc': Metadata(name='toc', value={}),
                      'toc_depth': Metadata(name='toc_depth', value='2'),
                      'chaptertitle': Metadata(name='chaptertitle', value=''),
                      'chapternumber': Metadata(name='chapternumber', value=''),
@@ -80,6 +87,7 @@ class Presentation(object):
     self.parser = Parser()
     self.chapters = []
     self.position = Position()
+    self.source = ''
     return
 
   def __str__(self):
@@ -107,7 +115,7 @@ class Presentation(object):
     yamlblocks = self.parser.tokenizer(source=source, re_search=self.parser.regexs['yamlblock'], exclude=codeblocks)
     try:
       for block in yamlblocks:
-        for data in load_all(block['match'].group().strip('---')):
+        for data in load_all(block['match'].group().strip('---'), Loader=SafeLoader):
           if 'metadata' in data:
             for element in data['metadata']:
               for key in element:
@@ -141,6 +149,47 @@ class Presentation(object):
     self.__update_toc()
     return
 
+  @staticmethod
+  def __tokens_within(tokens, starts, parent):
+    """Get the tokens starting inside the parent token, namely between its start and its next end (included).
+
+    Parameters
+    ----------
+    tokens: list
+      tokens sorted by their start position
+    starts: list
+      start positions of tokens
+    parent: dict
+      parent token
+
+    Returns
+    -------
+    list
+      tokens starting inside the parent one
+    """
+    return tokens[bisect_left(starts, parent['start']):bisect_right(starts, parent['end_next'])]
+
+  @staticmethod
+  def __write(path, contents):
+    """Write contents into a file atomically, namely the file is either the old one or the new complete one.
+
+    Parameters
+    ----------
+    path: str
+      file path
+    contents: str
+      file contents
+    """
+    try:
+      with open(path + '.tmp', 'w') as tmp:
+        tmp.write(contents)
+      os.replace(path + '.tmp', path)
+    except BaseException:
+      if os.path.exists(path + '.tmp'):
+        os.remove(path + '.tmp')
+      raise
+    return
+
   def __check_bad_sectioning(self, tokens):
     """Check if the presentation has a bad sectioning.
 
@@ -188,7 +237,7 @@ class Presentation(object):
           for subsection in section.subsections:
             for slide in subsection.slides:
               if slide.overtheme.custom:
-                doc.stag('link', rel='stylesheet', href='css/slide-' + str(slide.number) + '-overtheme.css')
+                doc.stag('link', rel='stylesheet', href='css/' + slide.div_id + '-overtheme.css')
 
   def __put_html_tags_scripts(self, doc, tag, config):
     """Put final tags for scripts into html doc.
@@ -235,7 +284,7 @@ class Presentation(object):
       with tag('script'):
         doc.text("""hljs.initHighlightingOnLoad();""")
 
-  def __put_html_slide_decorators(self, tag, doc, decorator, position=None, overtheme=None, current=None):
+  def __put_html_slide_decorators(self, tag, doc, decorator, theme, position=None, current=None):
     """Put html data of headers, footers and sidebars.
 
     Parameters
@@ -243,39 +292,22 @@ class Presentation(object):
     doc: Doc
     tag: tag
     decorator: {header, footer, sidebar}
+    theme: Theme()
+      actual theme of the slide, namely its overtheme if custom or the presentation theme
     position: {'L','R'}
       sidebars position, L => left, R => right
     current: list
     """
-    if overtheme is not None and overtheme.custom:
-      theme = overtheme
-    else:
-      theme = self.theme
-    decorators = getattr(theme, 'slide_' + decorator)
-    for decor in sorted(decorators):
-      insert = True
-      # position check for sidebars
-      if decorator == 'sidebar' and position is not None:
-        for css in decorators[decor]:
-          for key in css:
-            if 'position' in key.lower():
-              pos = css[key]
-              break
-        insert = pos.lower() == position.lower()
-      # active check
-      for css in decorators[decor]:
-        for key in css:
-          if 'active' in key.lower():
-            insert = insert and css[key].lower() == 'yes'
-      if insert:
-        placeholders = theme.get_slide_decorators_metadata(decorator=decorator, name=decor)
-        for metadata in self.metadata:
-          placeholders = self.metadata[metadata].parse(parser=self.parser, source=placeholders, toc_depth=self.metadata['toc_depth'].value, max_time=self.metadata['max_time'].value, current=current)
-        if decorator != 'sidebar':
-          with doc.tag('div'):
-            doc.attr(style='clear: both;')
-        with tag('div', klass='slide-' + decor):
-          doc.asis(placeholders)
+    toc_depth = self.metadata['toc_depth'].value
+    max_time = self.metadata['max_time'].value
+    for decor, placeholders in theme.get_slide_decorators(decorator=decorator, position=position):
+      for metadata in self.metadata.values():
+        placeholders = metadata.parse(parser=self.parser, source=placeholders, toc_depth=toc_depth, max_time=max_time, current=current)
+      if decorator != 'sidebar':
+        with doc.tag('div'):
+          doc.attr(style='clear: both;')
+      with tag('div', klass='slide-' + decor):
+        doc.asis(placeholders)
 
   def parse(self, config, source):
     """Parse presentation from source stream.
@@ -287,19 +319,21 @@ class Presentation(object):
     source: str
     """
     complete_source = self.parser.includes(source=source)
+    self.source = complete_source
     if config.print_parsed_source:
       print(complete_source)
     self.__get_metadata(source=complete_source)
     self.__get_theme(source=complete_source)
-    new_theme = Theme()
-    new_theme.set_from(other=self.theme)
     tokens = self.parser.tokenize(source=complete_source)
     self.__check_bad_sectioning(tokens=tokens)
     chapters_number = 0
     sections_number = 0
     subsections_number = 0
     slides_number = 0
+    # the titlepage is the first slide marked as such, it is inserted into the first subsection
+    titlepage = next((sld for sld in tokens['slides'] if '$titlepage' in sld['match'].group().lower()), None)
     titlepage_inserted = False
+    starts = {kind: [token['start'] for token in tokens[kind]] for kind in ('sections', 'subsections', 'slides')}
     for chap in tokens['chapters']:
       chapters_number += 1
       slide_local_numbers = [0, 0, 0]
@@ -307,19 +341,26 @@ class Presentation(object):
         chapter = Chapter(number=chapters_number, title=chap['match'].group('expr'))
       else:
         chapter = Chapter(number=chapters_number, title='')
-      for sec in tokens['sections']:
+      for sec in Presentation.__tokens_within(tokens['sections'], starts['sections'], chap):
         if sec['start'] >= chap['start'] and sec['start'] <= chap['end_next']:
           sections_number += 1
           slide_local_numbers[1] = 0
           slide_local_numbers[2] = 0
           section = Section(number=sections_number, title=sec['match'].group('expr'))
-          for subsec in tokens['subsections']:
+          for subsec in Presentation.__tokens_within(tokens['subsections'], starts['subsections'], sec):
             if subsec['start'] >= sec['start'] and subsec['start'] <= sec['end_next']:
               subsections_number += 1
               slide_local_numbers[2] = 0
               subsection = Subsection(number=subsections_number, title=subsec['match'].group('expr'))
-              for sld in tokens['slides']:
-                if '$titlepage' in sld['match'].group().lower() and not titlepage_inserted:
+              slides = Presentation.__tokens_within(tokens['slides'], starts['slides'], subsec)
+              if titlepage is not None and not titlepage_inserted:
+                # the titlepage keeps its source order with respect to the subsection slides
+                if titlepage['start'] < subsec['start']:
+                  slides = [titlepage] + slides
+                elif titlepage['start'] > subsec['end_next']:
+                  slides = slides + [titlepage]
+              for sld in slides:
+                if sld is titlepage and not titlepage_inserted:
                   slide = Slide(number=0,
                                 title='titlepage',
                                 contents=complete_source[sld['end']:sld['end_next']])
@@ -387,6 +428,9 @@ class Presentation(object):
       with tag('body', onload="resetCountdown(" + str(self.metadata['max_time'].value) + ");"):
         doc.attr(klass='impress-not-supported')
         with tag('div', id='impress'):
+          # slides must be rendered sequentially, in presentation order: boxes, figures, tables, notes and videos
+          # are numbered by global counters while slides are rendered and the chapter/section/subsection/slide
+          # metadata are updated in place for each slide
           # numbering: [local_chap, local_sec, local_subsec, local_slide]
           current = [0, 0, 0, 0]
           for chapter in self.chapters:
@@ -411,26 +455,59 @@ class Presentation(object):
                   current[3] += 1
                   self.metadata['slidetitle'].update_value(value=slide.title)
                   self.metadata['slidenumber'].update_value(value=slide.number)
+                  if slide.overtheme.custom:
+                    slide_theme = slide.overtheme
+                  else:
+                    slide_theme = self.theme
                   with doc.tag('div'):
                     chapter.put_html_attributes(doc=doc)
                     section.put_html_attributes(doc=doc)
                     subsection.put_html_attributes(doc=doc)
                     slide.put_html_attributes(doc=doc)
-                    self.__put_html_slide_decorators(tag=tag, doc=doc, decorator='header', current=current, overtheme=slide.overtheme)
+                    self.__put_html_slide_decorators(tag=tag, doc=doc, decorator='header', theme=slide_theme, current=current)
                     # with doc.tag('div'):
                       # doc.attr(style='clear: both;')
-                    self.__put_html_slide_decorators(tag=tag, doc=doc, decorator='sidebar', position='L', current=current, overtheme=slide.overtheme)
+                    self.__put_html_slide_decorators(tag=tag, doc=doc, decorator='sidebar', theme=slide_theme, position='L', current=current)
                     slide.to_html(doc=doc, parser=self.parser, metadata=self.metadata, theme=self.theme, current=current)
-                    self.__put_html_slide_decorators(tag=tag, doc=doc, decorator='sidebar', position='R', current=current, overtheme=slide.overtheme)
+                    self.__put_html_slide_decorators(tag=tag, doc=doc, decorator='sidebar', theme=slide_theme, position='R', current=current)
                     # with doc.tag('div'):
                       # doc.attr(style='clear: both;')
-                    self.__put_html_slide_decorators(tag=tag, doc=doc, decorator='footer', current=current, overtheme=slide.overtheme)
+                    self.__put_html_slide_decorators(tag=tag, doc=doc, decorator='footer', theme=slide_theme, current=current)
         self.__put_html_tags_scripts(doc=doc, tag=tag, config=config)
     # source = re.sub(r"<li>(?P<item>.*)</li>", r"<li><span>\g<item></span></li>", source)
-    html = indent(doc.getvalue())
-    return html
+    # indent needs the whole document, thus it cannot be streamed: release at least the document pieces before it
+    html = doc.getvalue()
+    del doc, tag, text
+    return indent(html)
+
+  def render(self, config, cache=None):
+    """Render the html form of presentation.
+
+    Parameters
+    ----------
+    config : MatisseConfig
+      MaTiSSe configuration
+    cache : BuildCache
+      cache of rendered presentations, if given the html is rendered only if the source or the configuration changed
+
+    Returns
+    -------
+    str
+      html form of presentation
+    """
+    if cache is None:
+      return self.to_html(config=config)
+    key = cache.key(source=self.source, config=config)
+    html_source = cache.load(key=key)
+    if html_source is None:
+      conversions = markdown_conversions()
+      conversions.update(cache.load_conversions())
+      html_source = self.to_html(config=config)
+      cache.store(key=key, html=html_source)
+      cache.store_conversions(conversions=conversions)
+    return html_source
 
-  def save(self, config, output):
+  def save(self, config, output, cache=None, html_source=None):
     """Save the html form of presentation into external file.
 
     Parameters
@@ -439,25 +516,29 @@ class Presentation(object):
       MaTiSSe configuration
     output : str
       output path
+    cache : BuildCache
+      cache of rendered presentations, if given the html is rendered only if the source or the configuration changed
+    html_source : str
+      html form of presentation already rendered, default none
     """
 
     if not os.path.exists(output):
       os.makedirs(output)
-    with open(os.path.join(output, 'index.html'), 'w') as html:
-      html.write(self.to_html(config=config))
+    if html_source is None:
+      html_source = self.render(config=config, cache=cache)
     # copy user defined directories if set
     if len(self.metadata['dirs_to_copy'].value) > 0:
       for data in self.metadata['dirs_to_copy'].value:
         sync_logger = logging.getLogger('sync_logger')
         sync(data, os.path.join(output, data), 'sync', create=True, logger=sync_logger)
     # css files
-    with open(os.path.join(output, 'css/theme.css'), 'w') as css_theme:
-      css_theme.writelines(self.theme.css)
+    Presentation.__write(path=os.path.join(output, 'css/theme.css'), contents=self.theme.css)
     for chapter in self.chapters:
       for section in chapter.sections:
         for subsection in section.subsections:
           for slide in subsection.slides:
             if slide.overtheme.custom:
-              with open(os.path.join(output, 'css/slide-' + str(slide.number) + '-overtheme.css'), 'w') as css_theme:
-                css_theme.writelines(slide.overtheme.css)
+              Presentation.__write(path=os.path.join(output, 'css/' + slide.div_id + '-overtheme.css'), contents=slide.overtheme.css)
+    # html is written as last: an interrupted save never leaves a new presentation with stale assets
+    Presentation.__write(path=os.path.join(output, 'index.html'), contents=html_source)
     return
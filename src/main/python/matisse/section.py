@@ -3,7 +3,6 @@
 section.py, module definition of Section class.
 """
 
-from collections import OrderedDict
 from .subsection import Subsection
 
 
@@ -28,7 +27,7 @@ class Section(object):
     self.number = number
     self.title = title
     self.subsections = []
-    self.toc = OrderedDict()
+    self.toc = {}
     return
 
   def __str__(self):
@@ -61,7 +60,8 @@ class Section(object):
     ----------
     doc: Doc
     """
-    doc.attr(('sectionnumber', str(self.number)))
     if self.title is not None:
-      doc.attr(('sectiontitle', str(self.title)))
+      doc.attr(('sectionnumber', str(self.number)), ('sectiontitle', str(self.title)))
+    else:
+      doc.attr(('sectionnumber', str(self.number)))
     return
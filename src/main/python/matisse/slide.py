@@ -12,6 +12,14 @@ from .table import Table
 from .theme import Theme
 from .video import Video
 
+# environments parsed into slide contents, in parsing order
+__envs__ = ((Box, Box.regexs['box']),
+            (Note, Note.regexs['note']),
+            (Figure, Figure.regexs['figure']),
+            (Table, Table.regexs['table']),
+            (Video, Video.regexs['video']),
+            (Columns, Columns.regexs['columns']))
+
 
 class Slide(object):
   """
@@ -33,8 +41,14 @@ class Slide(object):
       position dictionary containing {'x': posx, 'y': posy, 'z': posz, 'rotx': rotx, 'roty': roty, 'rotz': rotz, 'scale': scaling}
     title: str
     contents: str
+
+    Attributes
+    ----------
+    div_id: str
+      id of the slide html div
     """
     self.number = number
+    self.div_id = 'slide-' + str(number)
     self.position = None
     self.set_position(position)
     self.title = title
@@ -59,12 +73,12 @@ class Slide(object):
     if len(yamlblocks) > 0:
       self.overtheme.get(source=''.join([block['match'].group().strip('---') for block in yamlblocks]),
                          name='overtheme',
-                         div_id='slide-' + str(self.number))
-      purged_contents = self.contents[:yamlblocks[0]['start']]
+                         div_id=self.div_id)
+      purged_contents = [self.contents[:yamlblocks[0]['start']]]
       for b, yamlblock in enumerate(yamlblocks[:-1]):
-        purged_contents += self.contents[yamlblock['end']:yamlblocks[b + 1]['start']]
-      purged_contents += self.contents[yamlblocks[-1]['end']:]
-      self.contents = purged_contents
+        purged_contents.append(self.contents[yamlblock['end']:yamlblocks[b + 1]['start']])
+      purged_contents.append(self.contents[yamlblocks[-1]['end']:])
+      self.contents = ''.join(purged_contents)
 
   def set_position(self, position):
     """Set slide position.
@@ -75,9 +89,7 @@ class Slide(object):
       position dictionary containing {'x': posx, 'y': posy, 'z': posz, 'rotx': rotx, 'roty': roty, 'rotz': rotz, 'scale': scaling}
     """
     if position is not None:
-      self.position = {}
-      for key in position:
-        self.position[key] = position[key]
+      self.position = dict(position)
 
   def put_html_attributes(self, doc):
     """Put html attibutes of the slide.
@@ -86,18 +98,62 @@ class Slide(object):
     ----------
     doc: Doc
     """
-    doc.attr(('id', 'slide-' + str(self.number)))
+    position = self.position
     # doc.attr(('title', str(self.title)))
-    doc.attr(('class', 'step slide'))
-    doc.attr(('data-x', str(self.position['x'])))
-    doc.attr(('data-y', str(self.position['y'])))
-    doc.attr(('data-z', str(self.position['z'])))
-    doc.attr(('data-scale', str(self.position['scale'])))
-    doc.attr(('data-rotate-x', str(self.position['rotx'])))
-    doc.attr(('data-rotate-y', str(self.position['roty'])))
-    doc.attr(('data-rotate-z', str(self.position['rotz'])))
+    doc.attr(('id', self.div_id),
+             ('class', 'step slide'),
+             ('data-x', str(position['x'])),
+             ('data-y', str(position['y'])),
+             ('data-z', str(position['z'])),
+             ('data-scale', str(position['scale'])),
+             ('data-rotate-x', str(position['rotx'])),
+             ('data-rotate-y', str(position['roty'])),
+             ('data-rotate-z', str(position['rotz'])))
     return
 
+  def __parse_env(self, Env, re_search, source, parser, theme):
+    """Parse an environment (box, note, figure...) into source converting its occurrences to html.
+
+    Parameters
+    ----------
+    Env: {Box, Note, Figure, Table, Video, Columns}
+      environment class
+    re_search: compiled regex
+      environment regex
+    source: str
+    parser: Parser
+    theme: Theme()
+      presentation theme
+
+    Returns
+    -------
+    str:
+      parsed source
+    """
+    if re_search.search(source) is None:
+      return source
+    codeblocks = parser.tokenizer(source=source, re_search=parser.regexs['codeblock'])
+    codes = parser.tokenizer(source=source, re_search=parser.regexs['code'], exclude=codeblocks)
+    yamlblocks = parser.tokenizer(source=source, re_search=parser.regexs['yamlblock'], exclude=codeblocks + codes)
+    envs = parser.tokenizer(source=source, re_search=re_search, exclude=codeblocks + yamlblocks + codes)
+    if len(envs) > 0:
+      parsed_source = [source[:envs[0]['start']]]
+      for e, env in enumerate(envs[:-1]):
+        current = Env(source=env['match'].group())
+        parsed_source.append(current.to_html())
+        parsed_source.append(source[env['end']:envs[e + 1]['start']])
+      if Env is Video:
+        if self.overtheme.custom:
+          current = Env(source=envs[-1]['match'].group(), theme=self.overtheme)
+        else:
+          current = Env(source=envs[-1]['match'].group(), theme=theme)
+      else:
+        current = Env(source=envs[-1]['match'].group())
+      parsed_source.append(current.to_html())
+      parsed_source.append(source[envs[-1]['end']:])
+      return ''.join(parsed_source)
+    return source
+
   def to_html(self, doc, parser, metadata, theme, current):
     """Generate html from self.
 
@@ -111,36 +167,13 @@ class Slide(object):
       presentation theme
     current: list
     """
-    def _parse_env(Env, re_search, source):
-      codeblocks = parser.tokenizer(source=source, re_search=parser.regexs['codeblock'])
-      codes = parser.tokenizer(source=source, re_search=parser.regexs['code'], exclude=codeblocks)
-      yamlblocks = parser.tokenizer(source=source, re_search=parser.regexs['yamlblock'], exclude=codeblocks + codes)
-      envs = parser.tokenizer(source=source, re_search=re_search, exclude=codeblocks + yamlblocks + codes)
-      if len(envs) > 0:
-        parsed_source = source[:envs[0]['start']]
-        for e, env in enumerate(envs[:-1]):
-          current = Env(source=env['match'].group())
-          parsed_source += current.to_html() + source[env['end']:envs[e + 1]['start']]
-        if Env is Video:
-          if self.overtheme.custom:
-            current = Env(source=envs[-1]['match'].group(), theme=self.overtheme)
-          else:
-            current = Env(source=envs[-1]['match'].group(), theme=theme)
-        else:
-          current = Env(source=envs[-1]['match'].group())
-        parsed_source += current.to_html() + source[envs[-1]['end']:]
-        return parsed_source
-      return source
-
     html = self.contents
-    for meta in metadata:
-      html = metadata[meta].parse(parser=parser, source=html, toc_depth=metadata['toc_depth'].value, max_time=metadata['max_time'].value, current=current)
-    html = _parse_env(Env=Box, re_search=Box.regexs['box'], source=html)
-    html = _parse_env(Env=Note, re_search=Note.regexs['note'], source=html)
-    html = _parse_env(Env=Figure, re_search=Figure.regexs['figure'], source=html)
-    html = _parse_env(Env=Table, re_search=Table.regexs['table'], source=html)
-    html = _parse_env(Env=Video, re_search=Video.regexs['video'], source=html)
-    html = _parse_env(Env=Columns, re_search=Columns.regexs['columns'], source=html)
+    toc_depth = metadata['toc_depth'].value
+    max_time = metadata['max_time'].value
+    for meta in metadata.values():
+      html = meta.parse(parser=parser, source=html, toc_depth=toc_depth, max_time=max_time, current=current)
+    for Env, re_search in __envs__:
+      html = self.__parse_env(Env=Env, re_search=re_search, source=html, parser=parser, theme=theme)
     with doc.tag('div', klass='slide-content'):
       doc.asis(markdown2html(source=html))
     return
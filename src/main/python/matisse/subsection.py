@@ -60,7 +60,8 @@ class Subsection(object):
     ----------
     doc: Doc
     """
-    doc.attr(('subsectionnumber', str(self.number)))
     if self.title is not None:
-      doc.attr(('subsectiontitle', str(self.title)))
+      doc.attr(('subsectionnumber', str(self.number)), ('subsectiontitle', str(self.title)))
+    else:
+      doc.attr(('subsectionnumber', str(self.number)))
     return
@@ -4,9 +4,11 @@
 theme.py, module definition of Theme class.
 """
 
-from copy import deepcopy
-from collections import OrderedDict
 from yaml import load_all, YAMLError
+try:
+  from yaml import CSafeLoader as SafeLoader
+except ImportError:
+  from yaml import SafeLoader
 from .box import Box
 from .note import Note
 from .figure import Figure
@@ -86,6 +88,7 @@ class Theme(object):
     self.css = None
     self.custom = False
     self.div_id = div_id
+    self.__slide_decorators = {}
     if source is not None:
       self.get(source=source, name=name, div_id=div_id)
     return
@@ -95,44 +98,68 @@ class Theme(object):
       return ''
     return self.css
 
+  @staticmethod
+  def __copy_css(data):
+    """Copy theme css data.
+
+    Theme data are (nested) lists and dictionaries of immutable values: copying the containers is enough to get an
+    independent copy, without the overhead of a generic deepcopy.
+
+    Parameters
+    ----------
+    data: list|dict|str
+      theme data
+
+    Returns
+    -------
+    list|dict|str:
+      copy of data
+    """
+    if isinstance(data, list):
+      return [Theme.__copy_css(element) for element in data]
+    if isinstance(data, dict):
+      return {key: Theme.__copy_css(value) for key, value in data.items()}
+    return data
+
   def set_from(self, other):
-    """Set self attributes deepcopying theme from other theme.
+    """Set self attributes copying theme from other theme.
 
     Parameters
     ----------
     other: Theme()
     """
-    self.canvas = deepcopy(other.canvas)
-    self.toc = deepcopy(other.toc)
-    self.toc_chapter_emph = deepcopy(other.toc_chapter_emph)
-    self.toc_section_emph = deepcopy(other.toc_section_emph)
-    self.toc_subsection_emph = deepcopy(other.toc_subsection_emph)
-    self.toc_slide_emph = deepcopy(other.toc_slide_emph)
-    self.slide = deepcopy(other.slide)
-    self.slide_content = deepcopy(other.slide_content)
-    self.slide_header = deepcopy(other.slide_header)
-    self.slide_footer = deepcopy(other.slide_footer)
-    self.slide_sidebar = deepcopy(other.slide_sidebar)
-    self.box = deepcopy(other.box)
-    self.box_caption = deepcopy(other.box_caption)
-    self.box_content = deepcopy(other.box_content)
-    self.note = deepcopy(other.note)
-    self.note_caption = deepcopy(other.note_caption)
-    self.note_content = deepcopy(other.note_content)
-    self.table = deepcopy(other.table)
-    self.table_caption = deepcopy(other.table_caption)
-    self.table_content = deepcopy(other.table_content)
-    self.figure = deepcopy(other.figure)
-    self.figure_caption = deepcopy(other.figure_caption)
-    self.figure_content = deepcopy(other.figure_content)
-    self.video = deepcopy(other.video)
-    self.video_caption = deepcopy(other.video_caption)
-    self.video_content = deepcopy(other.video_content)
-    self.slide_header_metadata = deepcopy(other.slide_header_metadata)
-    self.slide_footer_metadata = deepcopy(other.slide_footer_metadata)
-    self.slide_sidebar_metadata = deepcopy(other.slide_sidebar_metadata)
-    self.css = deepcopy(other.css)
-    self.custom = deepcopy(other.custom)
+    self.canvas = self.__copy_css(other.canvas)
+    self.toc = self.__copy_css(other.toc)
+    self.toc_chapter_emph = self.__copy_css(other.toc_chapter_emph)
+    self.toc_section_emph = self.__copy_css(other.toc_section_emph)
+    self.toc_subsection_emph = self.__copy_css(other.toc_subsection_emph)
+    self.toc_slide_emph = self.__copy_css(other.toc_slide_emph)
+    self.slide = self.__copy_css(other.slide)
+    self.slide_content = self.__copy_css(other.slide_content)
+    self.slide_header = self.__copy_css(other.slide_header)
+    self.slide_footer = self.__copy_css(other.slide_footer)
+    self.slide_sidebar = self.__copy_css(other.slide_sidebar)
+    self.box = self.__copy_css(other.box)
+    self.box_caption = self.__copy_css(other.box_caption)
+    self.box_content = self.__copy_css(other.box_content)
+    self.note = self.__copy_css(other.note)
+    self.note_caption = self.__copy_css(other.note_caption)
+    self.note_content = self.__copy_css(other.note_content)
+    self.table = self.__copy_css(other.table)
+    self.table_caption = self.__copy_css(other.table_caption)
+    self.table_content = self.__copy_css(other.table_content)
+    self.figure = self.__copy_css(other.figure)
+    self.figure_caption = self.__copy_css(other.figure_caption)
+    self.figure_content = self.__copy_css(other.figure_content)
+    self.video = self.__copy_css(other.video)
+    self.video_caption = self.__copy_css(other.video_caption)
+    self.video_content = self.__copy_css(other.video_content)
+    self.slide_header_metadata = self.__copy_css(other.slide_header_metadata)
+    self.slide_footer_metadata = self.__copy_css(other.slide_footer_metadata)
+    self.slide_sidebar_metadata = self.__copy_css(other.slide_sidebar_metadata)
+    self.css = other.css
+    self.custom = other.custom
+    self.__slide_decorators = {}
 
   def copy_from(self, other):
     """Copy attributes from other theme if self has not already set those attributes.
@@ -212,6 +239,7 @@ class Theme(object):
         append_css(my_element=self.slide_sidebar_metadata[sidebar], other_element=other.slide_sidebar_metadata[sidebar])
     self.__check_slide()
     self.__get_css()
+    self.__slide_decorators = {}
 
   @staticmethod
   def theme2css(div, div_id, klass, theme_list):
@@ -233,21 +261,21 @@ class Theme(object):
     css: str
     """
     if len(theme_list) > 0:
-      head = ''
+      css = ['\n']
       if div_id != '':
-        head += '#' + div_id
+        css.extend(('#', div_id))
       if div != '':
-        head += ' ' + div + ' '
+        css.extend((' ', div, ' '))
       if klass != '':
         if klass == 'slide':
-          head += '.' + klass + ' '
+          css.extend(('.', klass, ' '))
         else:
-          head += ' .' + klass + ' '
-      css = ['\n' + head + '{']
+          css.extend((' .', klass, ' '))
+      css.append('{')
       for element in theme_list:
         for key in element:
           if 'metadata' not in key.lower():
-            css.append('\n  ' + key + ': ' + element[key] + ';')
+            css.extend(('\n  ', key, ': ', element[key], ';'))
       css.append('\n}')
       return ''.join(css)
     return ''
@@ -284,17 +312,17 @@ class Theme(object):
     def __get_decorators(decorator):
       decorators = getattr(self, 'slide_' + decorator)
       for decor in decorators:
-        getattr(self, 'slide_' + decorator + '_metadata')[decor] = OrderedDict()
+        getattr(self, 'slide_' + decorator + '_metadata')[decor] = {}
         for data in decorators[decor]:
           for key in data:
             if 'metadata' in key.lower():
               for meta in data[key]:
                 for meta_key in meta:
-                  css = ''
+                  css = []
                   for elem in meta[meta_key]:
                     for elem_key in elem:
-                      css += elem_key + ':' + elem[elem_key] + ';'
-                  getattr(self, 'slide_' + decorator + '_metadata')[decor][meta_key] = css
+                      css.extend((elem_key, ':', elem[elem_key], ';'))
+                  getattr(self, 'slide_' + decorator + '_metadata')[decor][meta_key] = ''.join(css)
 
     __get_decorators(decorator='header')
     __get_decorators(decorator='footer')
@@ -517,34 +545,40 @@ class Theme(object):
           return css[key]
     return ''
 
+  @staticmethod
+  def __get_percent(attribute, css_list):
+    """Get a percentage css attribute from css_list as integer.
+
+    Parameters
+    ----------
+    attribute: str
+      attribute name
+    css_list: list
+      list of css attributes
+
+    Returns
+    -------
+    int:
+      attribute value, 0 if the attribute is not set
+    """
+    value = Theme.__get_attribute(attribute=attribute, css_list=css_list).strip('%')
+    if value != '':
+      return int(value)
+    return 0
+
   def __get_slide_content_height(self):
     """Get the height of the slide content from the headers and footers remainder height.
 
     Returns
     -------
-    height: str
+    height: int
     """
     height = 0
-    for header in self.slide_header:
-      active = self.__check_active(decorator=self.slide_header[header])
-      if active:
-        height += int(self.__get_attribute(attribute='height', css_list=self.slide_header[header]).strip('%'))
-        margin = self.__get_attribute(attribute='margin-top', css_list=self.slide_header[header]).strip('%')
-        if margin != '':
-          height += int(margin)
-        margin = self.__get_attribute(attribute='margin-bottom', css_list=self.slide_header[header]).strip('%')
-        if margin != '':
-          height += int(margin)
-    for footer in self.slide_footer:
-      active = self.__check_active(decorator=self.slide_footer[footer])
-      if active:
-        height += int(self.__get_attribute(attribute='height', css_list=self.slide_footer[footer]).strip('%'))
-        margin = self.__get_attribute(attribute='margin-top', css_list=self.slide_footer[footer]).strip('%')
-        if margin != '':
-          height += int(margin)
-        margin = self.__get_attribute(attribute='margin-bottom', css_list=self.slide_footer[footer]).strip('%')
-        if margin != '':
-          height += int(margin)
+    for decorator in list(self.slide_header.values()) + list(self.slide_footer.values()):
+      if self.__check_active(decorator=decorator):
+        height += int(self.__get_attribute(attribute='height', css_list=decorator).strip('%'))
+        height += self.__get_percent(attribute='margin-top', css_list=decorator)
+        height += self.__get_percent(attribute='margin-bottom', css_list=decorator)
     return 100 - height
 
   def __get_slide_content_width(self):
@@ -552,24 +586,24 @@ class Theme(object):
 
     Returns
     -------
-    width: str
+    width: int
     """
     width = 0
-    for sidebar in self.slide_sidebar:
-      active = self.__check_active(decorator=self.slide_sidebar[sidebar])
-      if active:
-        width += int(self.__get_attribute(attribute='width', css_list=self.slide_sidebar[sidebar]).strip('%'))
-        margin = self.__get_attribute(attribute='margin-left', css_list=self.slide_sidebar[sidebar]).strip('%')
-        if margin != '':
-         width += int(margin)
-        margin = self.__get_attribute(attribute='margin-right', css_list=self.slide_sidebar[sidebar]).strip('%')
-        if margin != '':
-         width += int(margin)
+    for sidebar in self.slide_sidebar.values():
+      if self.__check_active(decorator=sidebar):
+        width += int(self.__get_attribute(attribute='width', css_list=sidebar).strip('%'))
+        width += self.__get_percent(attribute='margin-left', css_list=sidebar)
+        width += self.__get_percent(attribute='margin-right', css_list=sidebar)
     return 100 - width
 
-  def __check_slide_sidebars_dimensions(self):
-    """Ensure dimensions assignment for slide sidebars theme."""
-    height = self.__get_slide_content_height()
+  def __check_slide_sidebars_dimensions(self, height):
+    """Ensure dimensions assignment for slide sidebars theme.
+
+    Parameters
+    ----------
+    height: int
+      height of the slide content
+    """
     for sidebar in self.slide_sidebar:
       # search for eventual margins
       #         top, bottom, right, left
@@ -603,10 +637,16 @@ class Theme(object):
       if not found_h:
         self.slide_sidebar[sidebar].append({'height': str(height - margin[0] - margin[1]) + '%'})
 
-  def __check_slide_content_dimensions(self):
-    """Ensure dimensions assignment for slide content theme."""
-    height = self.__get_slide_content_height()
-    width = self.__get_slide_content_width()
+  def __check_slide_content_dimensions(self, height, width):
+    """Ensure dimensions assignment for slide content theme.
+
+    Parameters
+    ----------
+    height: int
+      height of the slide content
+    width: int
+      width of the slide content
+    """
     # search for eventual margins
     #         top, bottom, right, left
     margin = [0, 0, 0, 0]
@@ -662,8 +702,9 @@ class Theme(object):
     self.__check_slide_dimensions()
     self.__check_slide_headers_dimensions()
     self.__check_slide_footers_dimensions()
-    self.__check_slide_sidebars_dimensions()
-    self.__check_slide_content_dimensions()
+    height = self.__get_slide_content_height()
+    self.__check_slide_sidebars_dimensions(height=height)
+    self.__check_slide_content_dimensions(height=height, width=self.__get_slide_content_width())
 
   def __get_slide(self, data):
     """
@@ -762,7 +803,7 @@ class Theme(object):
     self.div_id = div_id
     if len(source) > 0:
       try:
-        for data in load_all(source):
+        for data in load_all(source, Loader=SafeLoader):
           if name in data:
             for element in data[name]:
               self.__get_copy_from(data=element)
@@ -782,6 +823,7 @@ class Theme(object):
       except YAMLError:
         print('No valid definition of theme has been found')
     self.__get_css()
+    self.__slide_decorators = {}
 
   def get_slide_decorators_metadata(self, decorator, name):
     """Get the slide decorators (headers, footers, sidebars) metadata placeholders.
@@ -804,6 +846,47 @@ class Theme(object):
       placeholders.append(r'$' + data + r'[' + metadata[data] + ']')
     return ''.join(placeholders)
 
+  def get_slide_decorators(self, decorator, position=None):
+    """Get the active slide decorators (headers, footers, sidebars) with their metadata placeholders.
+
+    The decorators are selected once for each decorator/position pair and then cached until the theme changes.
+
+    Parameters
+    ----------
+    decorator: str
+      header|footer|sidebar
+    position: {'L','R'}, optional
+      sidebars position, L => left, R => right
+
+    Returns
+    -------
+    tuple:
+      (name, metadata placeholder) pairs of the active decorators, sorted by name
+    """
+    key = (decorator, position)
+    if key not in self.__slide_decorators:
+      decorators = getattr(self, 'slide_' + decorator)
+      active = []
+      for decor in sorted(decorators):
+        insert = True
+        # position check for sidebars
+        if decorator == 'sidebar' and position is not None:
+          for css in decorators[decor]:
+            for key_css in css:
+              if 'position' in key_css.lower():
+                pos = css[key_css]
+                break
+          insert = pos.lower() == position.lower()
+        # active check
+        for css in decorators[decor]:
+          for key_css in css:
+            if 'active' in key_css.lower():
+              insert = insert and css[key_css].lower() == 'yes'
+        if insert:
+          active.append((decor, self.get_slide_decorators_metadata(decorator=decorator, name=decor)))
+      self.__slide_decorators[key] = tuple(active)
+    return self.__slide_decorators[key]
+
   def get_slide_transition(self):
     """Get slide transition (positioning) informations.
 
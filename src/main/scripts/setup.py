@@ -33,13 +33,13 @@ if __name__ == '__main__':
                      'Environment :: Console',
                      'Intended Audience :: End Users/Desktop',
                      'Programming Language :: Python',
-                     'Programming Language :: Python :: 2',
-                     'Programming Language :: Python :: 2.7',
                      'Programming Language :: Python :: 3',
-                     'Programming Language :: Python :: 3.4',
+                     'Programming Language :: Python :: 3 :: Only',
+                     'Programming Language :: Python :: 3.7',
                      'Topic :: Text Processing'],
         entry_points={'console_scripts': []},
-        package_data={'': ['*.md', '*.css', '*.js', '*.png']},
+        package_data={'': ['*.md', '*.css', '*.js', '*.png', 'utils/*.md']},
         data_files=__data_files_pairs__,
         include_package_data=True,
+        python_requires='>=3.7',
         install_requires=["markdown", "yattag", "pyyaml", "dirsync"])
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""Testing the cache of rendered presentations"""
+
+import os
+from shutil import rmtree
+import tempfile
+import unittest
+from unittest import mock
+from matisse.build_cache import BuildCache
+from matisse.matisse_config import MatisseConfig
+
+
+class BuildCacheTest(unittest.TestCase):
+  """Testing suite for BuildCache."""
+
+  def setUp(self):
+    self.path = tempfile.mkdtemp()
+    self.cache = BuildCache(version='1.0.0', path=os.path.join(self.path, 'matisse'))
+    self.config = MatisseConfig()
+
+  def tearDown(self):
+    rmtree(self.path)
+
+  def cached_presentations(self):
+    """Return the names of the cached presentations."""
+    return sorted(entry for entry in os.listdir(self.cache.path) if entry.endswith('.html'))
+
+  def test_key_stability(self):
+    """Test that the key depends only on the code signature, configuration and source."""
+    key = self.cache.key(source='#### Slide', config=self.config)
+    self.assertEqual(key, self.cache.key(source='#### Slide', config=self.config))
+    self.assertEqual(key, BuildCache(version='1.0.0', path=self.path).key(source='#### Slide', config=MatisseConfig()))
+    self.assertNotEqual(key, self.cache.key(source='#### Other slide', config=self.config))
+    self.assertNotEqual(key, BuildCache(version='1.0.1').key(source='#### Slide', config=self.config))
+    config = MatisseConfig()
+    config.pdf = True
+    self.assertNotEqual(key, self.cache.key(source='#### Slide', config=config))
+    with mock.patch('matisse.build_cache.markdown_signature', return_value='markdown-0.0.0'):
+      cache = BuildCache(version='1.0.0', path=self.path)
+      self.assertNotEqual(key, cache.key(source='#### Slide', config=self.config))
+    with mock.patch.object(BuildCache, '_BuildCache__code_digest', return_value='modified'):
+      cache = BuildCache(version='1.0.0', path=self.path)
+      self.assertNotEqual(key, cache.key(source='#### Slide', config=self.config))
+    with mock.patch('matisse.build_cache.yattag.__version__', '0.0.0'):
+      cache = BuildCache(version='1.0.0', path=self.path)
+      self.assertNotEqual(key, cache.key(source='#### Slide', config=self.config))
+
+  def test_store_load(self):
+    """Test the load/store round trip."""
+    self.assertIsNone(self.cache.load(key='missing'))
+    self.cache.store(key='presentation', html='<html>è</html>')
+    self.assertEqual(self.cache.load(key='presentation'), '<html>è</html>')
+    self.assertEqual(self.cached_presentations(), ['presentation.html'])
+
+  def test_conversions_store_load(self):
+    """Test the load/store round trip of the markdown conversions."""
+    self.assertEqual(self.cache.load_conversions(), {})
+    self.cache.store_conversions(conversions={'*a*': '<p><em>a</em></p>'})
+    self.assertEqual(self.cache.load_conversions(), {'*a*': '<p><em>a</em></p>'})
+    with mock.patch('matisse.build_cache.markdown_signature', return_value='markdown-0.0.0'):
+      cache = BuildCache(version='1.0.0', path=self.cache.path)
+      self.assertEqual(cache.load_conversions(), {})
+    with mock.patch.object(BuildCache, '_BuildCache__code_digest', return_value='modified'):
+      cache = BuildCache(version='1.0.0', path=self.cache.path)
+      self.assertEqual(cache.load_conversions(), {})
+
+  def test_purge(self):
+    """Test that only the most recent max_entries presentations are retained."""
+    self.cache.max_entries = 3
+    for number in range(5):
+      self.cache.store(key='presentation-' + str(number), html='<html></html>')
+      os.utime(os.path.join(self.cache.path, 'presentation-' + str(number) + '.html'), (number, number))
+    self.assertEqual(self.cached_presentations(), ['presentation-2.html', 'presentation-3.html', 'presentation-4.html'])
+
+  def test_purge_bytes(self):
+    """Test that only the most recent presentations within max_bytes are retained."""
+    self.cache.max_bytes = 40
+    for number in range(5):
+      self.cache.store(key='presentation-' + str(number), html='<html>' + 'x' * 4 + '</html>')
+      os.utime(os.path.join(self.cache.path, 'presentation-' + str(number) + '.html'), (number, number))
+    self.assertEqual(self.cached_presentations(), ['presentation-3.html', 'presentation-4.html'])
+
+  def test_unwritable(self):
+    """Test that an unwritable cache is ignored."""
+    not_a_dir = os.path.join(self.path, 'file')
+    open(not_a_dir, 'w').close()
+    cache = BuildCache(version='1.0.0', path=os.path.join(not_a_dir, 'matisse'))
+    cache.store(key='presentation', html='<html></html>')
+    cache.store_conversions(conversions={'*a*': '<p><em>a</em></p>'})
+    self.assertIsNone(cache.load(key='presentation'))
+    self.assertEqual(cache.load_conversions(), {})
+
+  def test_failed_store(self):
+    """Test that a failed store leaves no temporary file."""
+    os.makedirs(os.path.join(self.cache.path, 'presentation.html'))
+    self.cache.store(key='presentation', html='<html></html>')
+    self.assertEqual(os.listdir(self.cache.path), ['presentation.html'])
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,19 @@
+#!/usr/bin/env python
+"""Testing the markdown conversion utilities"""
+
+import unittest
+from matisse.markdown_utils import markdown2html
+
+
+class MarkdownUtilsTest(unittest.TestCase):
+  """Testing suite for markdown2html."""
+
+  def test_abbreviations_not_leaking(self):
+    """Test that the abbreviations defined into a conversion do not leak into the next ones."""
+    html = markdown2html('The HTML specification.\n\n*[HTML]: Hyper Text Markup Language')
+    self.assertIn('<abbr', html)
+    self.assertNotIn('<abbr', markdown2html('More HTML here.'))
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+"""Testing the reading of markdown sources"""
+
+import mmap
+import os
+from shutil import rmtree
+import tempfile
+import unittest
+from unittest import mock
+from matisse.matisse import decode_source, read_source
+
+
+class ReadSourceTest(unittest.TestCase):
+  """Testing suite for read_source and decode_source."""
+
+  def setUp(self):
+    self.path = tempfile.mkdtemp()
+
+  def tearDown(self):
+    rmtree(self.path)
+
+  def write_source(self, raw):
+    """Write a source file and return its path."""
+    path = os.path.join(self.path, 'test.md')
+    with open(path, 'wb') as source:
+      source.write(raw)
+    return path
+
+  def check_read(self, raw, expected):
+    """Check the reading of a source by both the plain read and the memory map."""
+    path = self.write_source(raw=raw)
+    self.assertEqual(read_source(path=path), expected)
+    with mock.patch('matisse.matisse.__mmap_threshold__', 0), \
+         mock.patch('matisse.matisse.mmap.mmap', wraps=mmap.mmap) as mapped:
+      self.assertEqual(read_source(path=path), expected)
+      self.assertTrue(mapped.called)
+
+  def test_decode_source(self):
+    """Test the utf-8 decoding and the latin-1 fallback."""
+    self.assertEqual(decode_source(raw='#### Slide è'.encode('utf-8')), '#### Slide è')
+    self.assertEqual(decode_source(raw='#### Slide è'.encode('latin-1')), '#### Slide è')
+
+  def test_utf8(self):
+    """Test the reading of a utf-8 source."""
+    self.check_read(raw='#### Slide è\n\nα β γ\n'.encode('utf-8'), expected='#### Slide è\n\nα β γ\n')
+
+  def test_latin1(self):
+    """Test the reading of a legacy latin-1 source."""
+    self.check_read(raw='#### Slide è\n\nà ù\n'.encode('latin-1'), expected='#### Slide è\n\nà ù\n')
+
+  def test_newlines(self):
+    """Test the translation of CRLF and CR newlines."""
+    self.check_read(raw=b'#### Slide\r\n\r\nCRLF\rCR\n', expected='#### Slide\n\nCRLF\nCR\n')
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -47,7 +47,7 @@ class SuiteTest(unittest.TestCase):
       os.chdir(cdir)
       if os.path.exists('test' + __pyver__):
         rmtree('test' + __pyver__)
-      syswork('MaTiSSe.py -i test.md -o test' + __pyver__)
+      syswork('MaTiSSe.py --no-cache -i test.md -o test' + __pyver__)
       os.chdir(old_pwd)
     self.assertEqual(0, 0)
 